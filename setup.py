@@ -60,6 +60,7 @@ setup(
         'paramiko>=2.4.2',
         'ssh-python==0.9.0',
         'requests>=2.20.1',
+        'importlib-metadata; python_version < "3.8"',
         'urllib3<1.26'
     ],
     extras_require={
@@ -833,7 +833,7 @@ class AnsibleCredentialManager(object):
                 ret_str += (chr(int(asc)))
             tmpparser = RawConfigParser()
             tmpparser.read_string(ret_str)
-        config.__set_credentials__(parser=tmpparser)
+        config.update(config.__set_credentials__(parser=tmpparser))
 
     def populate_teflo_cfg_credentials(self):
         if not self.__config.get("CREDENTIALS") and self.__config.get("CREDENTIAL_PATH"):
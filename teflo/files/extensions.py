@@ -44,7 +44,7 @@ def valid_orchestrator(value, rule_obj, path):
     if value.lower() not in orchestrators:
         raise AssertionError(
             'Orchestrator %s is invalid.\n'
-            'Available orchestrators %s' % (value, orchestrators)
+            'Available orchestrators %s' % (value, list(orchestrators))
         )
     return True
 
@@ -55,7 +55,7 @@ def valid_executor(value, rule_obj, path):
     if value.lower() not in executors:
         raise AssertionError(
             'Executor %s is invalid.\n'
-            'Available executors %s' % (value, executors)
+            'Available executors %s' % (value, list(executors))
         )
     return True
 
@@ -24,54 +24,98 @@
     :copyright: (c) 2021 Red Hat, Inc.
     :license: GPLv3, see LICENSE for more details.
 """
-import inspect
+import atexit
 import json
 import os
 import pkgutil
 import random
 import re
+import shlex
 import socket
 import string
 import subprocess
 import sys
+import threading
 import time
 import click
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from logging import getLogger
 import fnmatch
 import stat
-import jinja2
-import requests
-from paramiko import RSAKey
-from ruamel.yaml.comments import CommentedMap as OrderedDict
 from collections import OrderedDict
 from ruamel.yaml import YAML
 import yaml
-from paramiko.ssh_exception import SSHException
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
 from ._compat import string_types
 from .constants import PROVISIONERS, RULE_HOST_NAMING, TASKLIST, NOTIFYSTATES
 from .exceptions import TefloError, HelpersError
-from pykwalify.core import Core
-from pykwalify.errors import CoreError, SchemaError
-from xml.etree import cElementTree as ET
-import socket
-from ssh.session import Session
-from ssh.key import import_privkey_file
-from ssh import options
-from ssh.exceptions import SSHError, HostKeyNotVerifiable, AuthenticationError, ConnectFailed, ConnectionLost
-import pkg_resources
+from xml.etree import ElementTree as ET
 
 LOG = getLogger(__name__)
 
 # sentinel
 _missing = object()
 
+# characters and generator used by gen_random_str
+_RAND_ALPHABET = string.ascii_lowercase + string.digits
+_SYSRAND = random.SystemRandom()
+
+# ssh_retry connectivity results keyed by (ip, user, key file, port)
+# holding (ssh errors, expiry time)
+_SSH_CHECK_CACHE = dict()
+_SSH_CHECK_TTL = 300
+_SSH_CHECK_FAILED_TTL = 60
+
+# authenticated ssh sessions reused by ssh_retry keyed like _SSH_CHECK_CACHE holding
+# (owning pid, session), each key is guarded by its own lock so a session is only used
+# by one check at a time. Sessions inherited by forked task workers are never used by them.
+_SSH_SESSIONS = dict()
+_SSH_SESSION_LOCKS = dict()
+_SSH_SESSION_LOCKS_GUARD = threading.Lock()
+
+# lookup_ip_of_hostname results keyed by host name holding (ip, expiry time)
+_DNS_CACHE = dict()
+_DNS_TTL = 300
+
+# to maintain the sequence in the results.yml file with ruamel
+_YAML = YAML()
+_YAML.default_flow_style = False
+_YAML.representer.ignore_aliases = lambda *data: True
+_YAML.Representer.add_representer(OrderedDict, _YAML.Representer.represent_dict)
+
+# credential keys masked by mask_credentials_password and the mask used for them
+_SENSITIVE_CRED_KEYS = ('password', 'token', 'key', 'id')
+_CRED_MASK = '********'
+
+# positions used by sort_tasklist for tasks and notification states
+_TASK_ORDER = {t: i for i, t in enumerate(TASKLIST)}
+_NOTIFY_ORDER = {t: i for i, t in enumerate(NOTIFYSTATES)}
+
+# Teflo specific folders in datafolder and .results folder skipped by walk_results_directory
+_RESULTS_EXCLUDE_DIRS = frozenset(('logs', 'rp_logs', 'rp_payload', 'inventory'))
+
+# addresses treated as the local machine by is_host_localhost
+_LOCALHOST = frozenset(['127.0.0.1', 'localhost', '::1', '0.0.0.0'])
+
+# supported (provider, provisioner) pairs built from the PROVISIONERS mapping
+_PROVIDER_PROVISIONER_PAIRS = frozenset(
+    (provider, provisioner) for provider, provisioners in PROVISIONERS.items()
+    for provisioner in (provisioners if isinstance(provisioners, list) else [provisioners])
+)
 
+
+@lru_cache(maxsize=1)
 def get_core_tasks_classes():
     """
     Go through all modules within teflo.tasks package and return
     the list of all tasks classes within it. All tasks within the teflo.tasks
     module are considered valid task class to be added into the pipeline.
-    :return: List of all valid tasks classes
+    The task classes are static so the result is only computed once.
+    :return: Tuple of all valid tasks classes
     """
     from .core import TefloTask
     from . import tasks
@@ -88,12 +132,75 @@ def get_core_tasks_classes():
     for importer, modname, ispkg in pkgutil.iter_modules(tasks.__path__, prefix):
         if str(modname).endswith('.ext'):
             continue
-        clsmembers = inspect.getmembers(sys.modules[modname], inspect.isclass)
-        for clsname, clsmember in clsmembers:
-            if (clsmember is not TefloTask) and issubclass(clsmember, TefloTask):
+        for clsmember in vars(sys.modules[modname]).values():
+            if isinstance(clsmember, type) and (clsmember is not TefloTask) and issubclass(clsmember, TefloTask):
                 tasks_list.append(clsmember)
 
-    return tasks_list
+    return tuple(tasks_list)
+
+
+@lru_cache(maxsize=None)
+def _load_plugins(group):
+    """Load all plugin classes registered under the given entry point group.
+    The result is cached since installed entry points do not change at runtime.
+
+    :param group: the entry point group name
+    :type group: str
+    :return: dictionary of entry point name to plugin class
+    :rtype: dict
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        from importlib_metadata import entry_points
+
+    eps = entry_points()
+    # python < 3.10 returns a dict of group to entry points
+    group_eps = eps.select(group=group) if hasattr(eps, 'select') else eps.get(group, [])
+
+    plugin_dict = {}
+    for entry_point in group_eps:
+        plugin_dict[entry_point.name] = entry_point.load()
+    return plugin_dict
+
+
+@lru_cache(maxsize=None)
+def _plugins_by_name(group, attr):
+    """Index the plugin classes of an entry point group by a class attribute.
+
+    :param group: the entry point group name
+    :type group: str
+    :param attr: the class attribute holding the plugin name
+    :type attr: str
+    :return: dictionary of plugin name to plugin class
+    :rtype: dict
+    """
+    plugins = {}
+    for plugin_class in _load_plugins(group).values():
+        plugins.setdefault(getattr(plugin_class, attr), plugin_class)
+    return plugins
+
+
+def _get_plugin_class(group, name, attr='__plugin_name__', prefix_match=False):
+    """Return the plugin class of an entry point group matching the name.
+
+    :param group: the entry point group name
+    :type group: str
+    :param name: the name of the plugin
+    :type name: str
+    :param attr: the class attribute holding the plugin name
+    :type attr: str
+    :param prefix_match: fall back to a plugin whose name starts with name
+    :type prefix_match: bool
+    :return: the plugin class or None
+    """
+    plugins = _plugins_by_name(group, attr)
+    plugin_class = plugins.get(name)
+    if plugin_class is None and prefix_match:
+        for plugin_name, plugin_cls in plugins.items():
+            if plugin_name.startswith(name):
+                return plugin_cls
+    return plugin_class
 
 
 # Using entry point to get the provisioners defined in teflo's setup.py file
@@ -101,10 +208,7 @@ def get_provisioners_plugin_classes():
     """Return all provisioner plugin classes discovered by teflo
     :return: The list of provisioner plugin classes
     """
-    provisioner_plugin_dict = {}
-    for entry_point in pkg_resources.iter_entry_points('provisioner_plugins'):
-        provisioner_plugin_dict[entry_point.name] = entry_point.load()
-    return provisioner_plugin_dict
+    return _load_plugins('provisioner_plugins')
 
 
 def get_default_provisioner_plugin(provider=None):
@@ -130,16 +234,14 @@ def get_default_provisioner_plugin(provider=None):
         return get_provisioner_plugin_class('linchpin')
 
 
+@lru_cache(maxsize=1)
 def get_provisioners_plugins_list():
     """
     Returns a list of all the valid provisioner gateways.
-    :return: list of provisioner gateways
+    :return: tuple of provisioner gateways
     """
-
-    valid_provisioners = []
-    for provisioner_gateway_class in get_provisioners_plugin_classes().values():
-        valid_provisioners.append(provisioner_gateway_class.__plugin_name__)
-    return valid_provisioners
+    return tuple(provisioner_gateway_class.__plugin_name__ for provisioner_gateway_class in
+                 get_provisioners_plugin_classes().values())
 
 
 def get_provisioner_plugin_class(name):
@@ -148,9 +250,7 @@ def get_provisioner_plugin_class(name):
     :param name: The name of the provisioner
     :return: The provisioner gateway class
     """
-    for provisioner in get_provisioners_plugin_classes().values():
-        if provisioner.__plugin_name__.startswith(name):
-            return provisioner
+    return _get_plugin_class('provisioner_plugins', name, prefix_match=True)
 
 
 # Using entry point to get the providers from within teflo as well as the ones coming from the external plugins
@@ -158,10 +258,7 @@ def get_provider_plugin_classes():
     """Return all provider plugin classes discovered by teflo
     :return: The list of provider plugin classes
     """
-    provider_plugin_dict = {}
-    for entry_point in pkg_resources.iter_entry_points('provider_plugins'):
-        provider_plugin_dict[entry_point.name] = entry_point.load()
-    return provider_plugin_dict
+    return _load_plugins('provider_plugins')
 
 
 def get_provider_plugin_class(name):
@@ -171,18 +268,17 @@ def get_provider_plugin_class(name):
     :param name: the name of the provider
     :return: the provider class
     """
-    for provider in get_provider_plugin_classes().values():
-        if provider.__provider_name__ == name:
-            return provider
+    return _get_plugin_class('provider_plugins', name, attr='__provider_name__')
 
 
+@lru_cache(maxsize=1)
 def get_provider_plugin_list():
     """
     Return the list of provider class based on the __provider_name__ set within
     the class.
-    :return: list of the the provider names
+    :return: tuple of the the provider names
     """
-    return [provider.__provider_name__ for provider in get_provider_plugin_classes().values()]
+    return tuple(provider.__provider_name__ for provider in get_provider_plugin_classes().values())
 
 
 # Using entry point to get the orchestrators defined in teflo's setup.py file
@@ -190,10 +286,7 @@ def get_orchestrators_plugin_classes():
     """Return all orchestrator plugin classes discovered by teflo
     :return: The list of orchestrator plugin classes
     """
-    orchestrator_plugin_dict = {}
-    for entry_point in pkg_resources.iter_entry_points('orchestrator_plugins'):
-        orchestrator_plugin_dict[entry_point.name] = entry_point.load()
-    return orchestrator_plugin_dict.values()
+    return _load_plugins('orchestrator_plugins').values()
 
 
 def get_orchestrator_plugin_class(name):
@@ -203,18 +296,17 @@ def get_orchestrator_plugin_class(name):
     :param name: the name of the orchestrator
     :return: the orchestrator class
     """
-    for orchestrator in get_orchestrators_plugin_classes():
-        if orchestrator.__plugin_name__ == name:
-            return orchestrator
+    return _get_plugin_class('orchestrator_plugins', name)
 
 
+@lru_cache(maxsize=1)
 def get_orchestrators_plugin_list():
     """Return a list of available orchestrators.
 
     :return: orchestrators
     """
-    return [orchestrator.__plugin_name__ for orchestrator in
-            get_orchestrators_plugin_classes()]
+    return tuple(orchestrator.__plugin_name__ for orchestrator in
+                 get_orchestrators_plugin_classes())
 
 
 # Using entry point to get the executors defined in teflo's setup.py file
@@ -223,10 +315,7 @@ def get_executors_plugin_classes():
     """Return all executor plugin classes discovered by teflo
     :return: The list of executor plugin classes
     """
-    executor_plugin_dict = {}
-    for entry_point in pkg_resources.iter_entry_points('executor_plugins'):
-        executor_plugin_dict[entry_point.name] = entry_point.load()
-    return executor_plugin_dict.values()
+    return _load_plugins('executor_plugins').values()
 
 
 def get_executor_plugin_class(name):
@@ -236,18 +325,17 @@ def get_executor_plugin_class(name):
     :param name: the name of the executor
     :return: the executor class
     """
-    for executor in get_executors_plugin_classes():
-        if executor.__executor_name__ == name:
-            return executor
+    return _get_plugin_class('executor_plugins', name, attr='__executor_name__')
 
 
+@lru_cache(maxsize=1)
 def get_executors_plugin_list():
     """Return a list of available executors.
 
     :return: executors
     """
-    return [executor.__executor_name__ for executor in
-            get_executors_plugin_classes()]
+    return tuple(executor.__executor_name__ for executor in
+                 get_executors_plugin_classes())
 
 
 # Using entry point to get the importers. These methods are being used to get the importer plugins external to teflo
@@ -255,10 +343,7 @@ def get_importers_plugin_classes():
     """Return all importer plugin classes discovered by teflo
     :return: The list of importer plugin classes
     """
-    ext_plugin_dict = {}
-    for entry_point in pkg_resources.iter_entry_points('importer_plugins'):
-        ext_plugin_dict[entry_point.name] = entry_point.load()
-    return ext_plugin_dict.values()
+    return _load_plugins('importer_plugins').values()
 
 
 def get_default_importer_plugin_class(provider):
@@ -266,20 +351,17 @@ def get_default_importer_plugin_class(provider):
     :param provider: The provider class
     :return: The importer plugin class
     """
-    for plugin_class in get_importers_plugin_classes():
-        if plugin_class.__plugin_name__.startswith(provider.__provider_name__):
-            return plugin_class
+    return _get_plugin_class('importer_plugins', provider.__provider_name__, prefix_match=True)
 
 
+@lru_cache(maxsize=1)
 def get_importers_plugin_list():
     """
     Returns a list of all the valid importer gateways.
-    :return: list of importer plugin names
+    :return: tuple of importer plugin names
     """
-    valid_reporters = []
-    for reporter_plugin_class in get_importers_plugin_classes():
-        valid_reporters.append(reporter_plugin_class.__plugin_name__)
-    return valid_reporters
+    return tuple(reporter_plugin_class.__plugin_name__ for reporter_plugin_class in
+                 get_importers_plugin_classes())
 
 
 def get_importer_plugin_class(name):
@@ -288,9 +370,7 @@ def get_importer_plugin_class(name):
     :param name: The name of the importer
     :return: The importer plugin class
     """
-    for reporter in get_importers_plugin_classes():
-        if reporter.__plugin_name__.startswith(name):
-            return reporter
+    return _get_plugin_class('importer_plugins', name, prefix_match=True)
 
 
 def is_provider_mapped_to_provisioner(provider, provisioner):
@@ -300,39 +380,25 @@ def is_provider_mapped_to_provisioner(provider, provisioner):
     :param provisioner:
     :return:
     """
-    if hasattr(provider, '__provider_name__'):
-        provider_name = provider.__provider_name__
-    else:
-        provider_name = provider
-    for provider_key, prov_val in PROVISIONERS.items():
-        if provider_name == provider_key:
-            if isinstance(prov_val, list):
-                for p in prov_val:
-                    if p == provisioner:
-                        return True
-            else:
-                if prov_val == provisioner:
-                    return True
-    return False
+    provider_name = getattr(provider, '__provider_name__', provider)
+    return (provider_name, provisioner) in _PROVIDER_PROVISIONER_PAIRS
 
 
+@lru_cache(maxsize=1)
 def get_notification_plugin_list():
     """Return a list of available notifications.
 
     :return: notifications
     """
-    return [notifier.__plugin_name__ for notifier in
-            get_notifiers_plugin_classes()]
+    return tuple(notifier.__plugin_name__ for notifier in
+                 get_notifiers_plugin_classes())
 
 
 def get_notifiers_plugin_classes():
     """Return all notification plugin classes discovered by teflo
     :return: The list of notification plugin classes
     """
-    notifier_plugin_dict = {}
-    for entry_point in pkg_resources.iter_entry_points('notification_plugins'):
-        notifier_plugin_dict[entry_point.name] = entry_point.load()
-    return notifier_plugin_dict.values()
+    return _load_plugins('notification_plugins').values()
 
 
 def get_notifier_plugin_class(name):
@@ -342,10 +408,7 @@ def get_notifier_plugin_class(name):
     :param name: the name of the notification
     :return: the notification class
     """
-    for notification in get_notifiers_plugin_classes():
-        if notification.__plugin_name__ == name or \
-                notification.__plugin_name__.startswith(name):
-            return notification
+    return _get_plugin_class('notification_plugins', name, prefix_match=True)
 
 
 def schema_validator(schema_data, schema_files, schema_creds=None, schema_ext_files=None):
@@ -361,6 +424,8 @@ def schema_validator(schema_data, schema_files, schema_creds=None, schema_ext_fi
     :type: list of file paths
     :return:
     """
+    from pykwalify.core import Core
+    from pykwalify.errors import CoreError, SchemaError
 
     schema = {}
 
@@ -393,9 +458,7 @@ def gen_random_str(char_num=8):
     :param char_num: the number of characters for the random string
     :return: random string
     """
-    return ''.join(random.SystemRandom().
-                   choice(string.ascii_lowercase + string.digits) for
-                   _ in range(char_num))
+    return ''.join(_SYSRAND.choices(_RAND_ALPHABET, k=char_num))
 
 
 def file_mgmt(operation, file_path, content=None, cfg_parser=None):
@@ -412,68 +475,57 @@ def file_mgmt(operation, file_path, content=None, cfg_parser=None):
     :type cfg_parser: bool
     :return: Data that was read from a file
     """
-    # to maintain the sequence in the results.yml file with ruamel
-    yaml = YAML()
-    yaml.default_flow_style = False
-    yaml.representer.ignore_aliases = lambda *data: True
-    yaml.Representer.add_representer(OrderedDict, yaml.Representer.represent_dict)
-
     # Determine file extension
     file_ext = os.path.splitext(file_path)[-1]
 
     if operation in ['r', 'read']:
         # Read
-        if os.path.exists(file_path):
+        try:
+            f_raw = open(file_path)
+        except FileNotFoundError:
+            raise IOError("%s file not found!" % file_path)
+        with f_raw:
             if file_ext == ".json":
                 # json
-                with open(file_path) as f_raw:
-                    return json.load(f_raw)
+                return json.load(f_raw)
             elif file_ext in ['.yaml', '.yml']:
                 # yaml
-                with open(file_path) as f_raw:
-                    return yaml.load(f_raw)
+                return _YAML.load(f_raw)
+            elif cfg_parser is not None:
+                # Config parser file
+                return cfg_parser.readfp(f_raw)
             else:
-                # text
-                with open(file_path) as f_raw:
-                    if cfg_parser is not None:
-                        # Config parser file
-                        return cfg_parser.readfp(f_raw)
-                    else:
-                        # lets check if it is json
-                        data = f_raw.read()
-                        try:
-                            return json.load(data)
-                        except Exception:
-                            # it wasn't json, lets try yaml
-                            try:
-                                return yaml.load(data)
-                            except Exception:
-                                # it wasn't yaml, lets just return pure string
-                                return data
-        else:
-            raise IOError("%s file not found!" % file_path)
+                # text, lets check if it is json
+                data = f_raw.read()
+                try:
+                    return json.load(data)
+                except Exception:
+                    # it wasn't json, lets try yaml
+                    try:
+                        return _YAML.load(data)
+                    except Exception:
+                        # it wasn't yaml, lets just return pure string
+                        return data
     elif operation in ['w', 'write']:
         # Write
-        mode = 'w+' if os.path.exists(file_path) else 'w'
-        if file_ext == ".json":
-            # json
-            with open(file_path, mode) as f_raw:
+        with open(file_path, 'w') as f_raw:
+            if file_ext == ".json":
+                # json
                 json.dump(content, f_raw, indent=4, sort_keys=True)
-        elif file_ext in ['.yaml', '.yml']:
-            # yaml
-            with open(file_path, mode) as f_raw:
-                yaml.dump(content, f_raw)
-        else:
-            # text
-            with open(file_path, mode) as f_raw:
-                if cfg_parser is not None:
-                    # Config parser file
-                    cfg_parser.write(f_raw)
-                else:
-                    f_raw.write(content)
+            elif file_ext in ['.yaml', '.yml']:
+                # yaml
+                _YAML.dump(content, f_raw)
+            elif cfg_parser is not None:
+                # Config parser file
+                cfg_parser.write(f_raw)
+            else:
+                # text
+                f_raw.write(content)
     elif operation in ['d', 'delete']:
-        if os.path.exists(file_path):
+        try:
             os.unlink(file_path)
+        except FileNotFoundError:
+            pass
     else:
         raise HelpersError("Unknown file operation: %s." % operation)
 
@@ -486,10 +538,17 @@ def is_url_valid(url):
     :return: True if url exists or false if url does not exist.
     :rtype: bool
     """
+    import requests
+
     try:
-        response = requests.get(url)
+        # only the headers are needed to know the url exists
+        response = requests.head(url, allow_redirects=True, timeout=5)
+        if response.status_code == 405:
+            # server does not support HEAD, fall back to GET without reading the body
+            response = requests.get(url, stream=True, timeout=5)
+            response.close()
         response.raise_for_status()
-    except requests.HTTPError as ex:
+    except (requests.HTTPError, requests.Timeout) as ex:
         LOG.error(ex)
         return False
     return True
@@ -505,29 +564,51 @@ def template_render(filepath, env_dict):
     :rtype: data stream
     """
     path, filename = os.path.split(filepath)
-    return jinja2.Environment(loader=jinja2.FileSystemLoader(
-        path), lstrip_blocks=True, trim_blocks=True).get_template(filename).render(env_dict)
+    return _jinja_env(path).get_template(filename).render(env_dict)
+
 
+@lru_cache(maxsize=64)
+def _jinja_env(path):
+    """
+    Return a jinja environment loading templates from the given directory.
+    Environments are cached per directory so compiled templates are reused
+    across renders.
+
+    :param path: directory containing the templates
+    :return: jinja environment
+    :rtype: jinja2.Environment
+    """
+    import jinja2
 
-def exec_local_cmd(cmd, env_var=None):
+    return jinja2.Environment(loader=jinja2.FileSystemLoader(path), lstrip_blocks=True, trim_blocks=True,
+                              cache_size=400)
+
+
+def exec_local_cmd(cmd, env_var=None, shell=True):
     """Execute command locally.
     :param cmd: command to run
     :type cmd: str
     :param env_var: a dictionary of environmental variables to pass to the subprocess
     :type env_var: dictionary
+    :param shell: run the command through the shell, when False the command is
+        split into arguments and executed directly
+    :type shell: bool
     """
     # updating passed env variables with os env variables
     if env_var:
         env_var.update(os.environ)
-    proc = subprocess.Popen(
+    if not shell and isinstance(cmd, string_types):
+        cmd = shlex.split(cmd)
+    with subprocess.Popen(
         cmd,
-        shell=True,
+        shell=shell,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
+        encoding='utf-8',
         env=env_var
-    )
-    output = proc.communicate()
-    return proc.returncode, output[0].decode('utf-8'), output[1].decode('utf-8')
+    ) as proc:
+        output = proc.communicate()
+    return proc.returncode, output[0], output[1]
 
 
 def exec_local_cmd_pipe(cmd, logger, env_var=None):
@@ -544,27 +625,22 @@ def exec_local_cmd_pipe(cmd, logger, env_var=None):
     # updating passed env variables with os env variables
     if env_var:
         env_var.update(os.environ)
-    proc = subprocess.Popen(
+    error = ""
+    with subprocess.Popen(
         cmd,
         shell=True,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        bufsize=2,
+        bufsize=1,
         close_fds=True,
+        encoding='utf-8',
         env=env_var
-    )
-    while True:
-        output, error = ("", "")
-        if proc.poll is not None:
-            output = proc.stdout.readline().decode('utf-8')
-        if output == "" and error == "" and proc.poll() is not None:
-            break
-        if output:
+    ) as proc:
+        for output in proc.stdout:
             logger.info(output.strip())
-    rc = proc.poll()
-    if rc != 0:
-        for line in proc.stderr:
-            error = error + line.decode('utf-8')
+        rc = proc.wait()
+        if rc != 0:
+            error = proc.stderr.read()
     return rc, error
 
 
@@ -576,18 +652,51 @@ class CustomDict(dict):
     or as a dict key-value.
 
     Deeper parameters within the data that contain its own data
-    are also represented as Resource
+    are also represented as CustomDict, converted when first accessed
+    through indexing, dot notation, get, setdefault, values or items.
     """
 
     def __init__(self, data={}):
         super(CustomDict, self).__init__(data)
-        for key, value in data.items():
-            if isinstance(value, dict):
-                value = CustomDict(value)
-            self[key] = value
+
+    def _convert(self, key, value):
+        """store a nested plain dict back as a CustomDict the first time it is read."""
+        if isinstance(value, dict) and not isinstance(value, CustomDict):
+            value = CustomDict(value)
+            super(CustomDict, self).__setitem__(key, value)
+        return value
+
+    def __getitem__(self, key):
+        return self._convert(key, super(CustomDict, self).__getitem__(key))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            super(CustomDict, self).__setitem__(key, default)
+        return self[key]
+
+    def _convert_all(self):
+        """convert every nested plain dict, used before handing out a view of the values."""
+        for key, value in super(CustomDict, self).items():
+            self._convert(key, value)
+
+    def values(self):
+        self._convert_all()
+        return super(CustomDict, self).values()
+
+    def items(self):
+        self._convert_all()
+        return super(CustomDict, self).items()
 
     def __getattr__(self, attr):
-        return self.get(attr)
+        try:
+            return self[attr]
+        except KeyError:
+            return None
 
     def __setattr__(self, key, value):
         self.__setitem__(key, value)
@@ -599,11 +708,8 @@ def filter_actions_on_failed_status(action_list):
     If no action with failed status is found the original list is returned
     :return: List of actions based on its status
     """
-    for index, action_item in enumerate(action_list):
-        if action_item.status == 1:
-            new_list = action_list[index:]
-            return new_list
-    return action_list
+    index = next((i for i, action_item in enumerate(action_list) if action_item.status == 1), None)
+    return action_list if index is None else action_list[index:]
 
 
 def filter_notifications_to_skip(notify_list, teflo_options):
@@ -614,8 +720,8 @@ def filter_notifications_to_skip(notify_list, teflo_options):
     """
 
     if teflo_options and teflo_options.get('skip_notify', False):
-        return [res for res in notify_list
-                if not {getattr(res, 'name')}.intersection(set(teflo_options.get('skip_notify')))]
+        skip_notify = set(teflo_options.get('skip_notify'))
+        return [res for res in notify_list if getattr(res, 'name') not in skip_notify]
     else:
         return notify_list
 
@@ -628,39 +734,41 @@ def filter_notifications_on_trigger(state, notify_list, passed_tasks, failed_tas
     """
     if state == 'on_demand':
         return [res for res in notify_list if getattr(res, 'on_demand')]
-    else:
-        # filter out all on_demand notifications
-        notify_list = [res for res in notify_list if not getattr(res, 'on_demand')]
+
+    passed_set = set(passed_tasks)
+    failed_set = set(failed_tasks)
 
     if state == 'on_start':
-        return [res for res in notify_list if getattr(res, 'on_start') and len(set(getattr(res, 'on_tasks', [])).
-                                                                               intersection(passed_tasks)) != 0]
+        return [res for res in notify_list
+                if not getattr(res, 'on_demand') and getattr(res, 'on_start') and not passed_set.isdisjoint(
+                    getattr(res, 'on_tasks', []))]
     elif state == 'on_complete':
-        ocl = list()
-
-        # filter out all on_start notifications
-        nl = [res for res in notify_list if not getattr(res, 'on_start')]
-
-        # not executing if on_success but there are failed tasks
-        passed = [nt for nt in nl if getattr(nt, 'on_success') is True and getattr(nt, 'on_failure') is False]
-        passed = [nt for nt in passed if len(failed_tasks) == 0 and len(set(getattr(nt, 'on_tasks')).
-                                                                        intersection(passed_tasks)) != 0]
-        ocl.extend(passed)
-
-        # not executing if on_failure but there are passed tasks
-        failed = [nt for nt in nl if getattr(nt, 'on_failure') is True and getattr(nt, 'on_success') is False]
-        failed = [nt for nt in failed if len(passed_tasks) == 0 and len(set(getattr(nt, 'on_tasks')).
-                                                                        intersection(failed_tasks)) != 0]
-        ocl.extend(failed)
-
-        # not executing if on_failure or on_success
-        mixed = [nt for nt in nl if getattr(nt, 'on_success') is True and getattr(nt, 'on_failure') is True]
-        mixed = [nt for nt in mixed if len(set(getattr(nt, 'on_tasks')).
-                                           intersection(failed_tasks)) != 0 or len(set(getattr(nt, 'on_tasks')).
-                                                                                   intersection(passed_tasks)) != 0]
-        ocl.extend(mixed)
+        passed = list()
+        failed = list()
+        mixed = list()
 
-        return ocl
+        for nt in notify_list:
+            # filter out all on_demand and on_start notifications
+            if getattr(nt, 'on_demand') or getattr(nt, 'on_start'):
+                continue
+            on_success = getattr(nt, 'on_success')
+            on_failure = getattr(nt, 'on_failure')
+            tasks = set(getattr(nt, 'on_tasks', []))
+
+            if on_success is True and on_failure is False:
+                # not executing if on_success but there are failed tasks
+                if not failed_set and tasks & passed_set:
+                    passed.append(nt)
+            elif on_failure is True and on_success is False:
+                # not executing if on_failure but there are passed tasks
+                if not passed_set and tasks & failed_set:
+                    failed.append(nt)
+            elif on_success is True and on_failure is True:
+                # not executing if on_failure or on_success
+                if tasks & failed_set or tasks & passed_set:
+                    mixed.append(nt)
+
+        return passed + failed + mixed
 
 
 def filter_resources_labels(res_list, teflo_options):
@@ -675,10 +783,11 @@ def filter_resources_labels(res_list, teflo_options):
     """
 
     if teflo_options and teflo_options.get('labels', ()):
-        return[res for res in res_list if set(getattr(res, 'labels')).intersection(set(teflo_options.get('labels')))]
+        labels = set(teflo_options.get('labels'))
+        return [res for res in res_list if not labels.isdisjoint(getattr(res, 'labels'))]
     elif teflo_options and teflo_options.get('skip_labels', ()):
-        return [res for res in res_list
-                if not set(getattr(res, 'labels')).intersection(set(teflo_options.get('skip_labels')))]
+        skip_labels = set(teflo_options.get('skip_labels'))
+        return [res for res in res_list if skip_labels.isdisjoint(getattr(res, 'labels'))]
     else:
         return res_list
 
@@ -705,7 +814,6 @@ def fetch_assets(hosts, task, all_hosts=True):
 
     # placeholders
     _hosts = list()
-    _all_hosts = list()
     _filtered_hosts = list()
     _type = None
 
@@ -715,29 +823,31 @@ def fetch_assets(hosts, task, all_hosts=True):
     elif 'package' in task:
         _type = 'package'
 
+    _all_hosts = list(hosts) if all_hosts else list()
+
     # determine the task host data types
     if all(isinstance(item, string_types) for item in task[_type].hosts):
+        task_host_names = frozenset(task[_type].hosts)
+        if 'all' in task_host_names:
+            # every scenario host is used, no need to match them
+            if hosts:
+                task[_type].hosts = list(hosts)
+            task[_type].all_hosts = _all_hosts
+            return task
         for host in hosts:
-            if all_hosts:
-                _all_hosts.append(host)
-            if 'all' in task[_type].hosts:
-                _hosts.append(host)
-                continue
-            if host.name in task[_type].hosts or [h for h in task[_type].hosts if h == host.name]:
+            if host.name in task_host_names:
                 _hosts.append(host)
                 continue
             elif hasattr(host, 'groups'):
-                for g in host.groups:
-                    if g in task[_type].hosts:
-                        _hosts.append(host)
+                if any(g in task_host_names for g in host.groups):
+                    _hosts.append(host)
     else:
+        task_host_names = [task_host.name for task_host in task[_type].hosts]
         for host in hosts:
-            if all_hosts:
-                _all_hosts.append(host)
-            for task_host in task[_type].hosts:
+            for task_host_name in task_host_names:
                 # additional check task_host.name in host.name was put in case when linchpin count was
                 # used and there are host resources with names matching original resource name
-                if host.name == task_host.name or task_host.name in host.name:
+                if host.name == task_host_name or task_host_name in host.name:
                     _hosts.append(host)
                     break
     if _hosts:
@@ -815,18 +925,97 @@ def filter_host_name(name):
     :param name: the name to be filtered
     :return: 20 characters filtered name
     """
-    result = RULE_HOST_NAMING.sub('', name)
-    return str(result[:20]).lower()
+    return RULE_HOST_NAMING.sub('', name)[:20].lower()
+
+
+def _ssh_session_lock(key):
+    """get the lock guarding the ssh session of the given server key
+    :param key: (ip, user, key file, port) of the server
+    :type key: tuple
+    :return: the lock of the server
+    :rtype: threading.Lock
+    """
+    with _SSH_SESSION_LOCKS_GUARD:
+        return _SSH_SESSION_LOCKS.setdefault(key, threading.Lock())
+
+
+def _open_ssh_session(server_ip, server_user, pkey, server_ssh_port, connect_timeout):
+    """open an authenticated ssh session to a server. A plain tcp connect is tried first
+    to fail fast on unreachable servers.
+    :param server_ip: server ip address
+    :type server_ip: str
+    :param server_user: user to authenticate as
+    :type server_user: str
+    :param pkey: private key to authenticate with
+    :param server_ssh_port: server ssh port
+    :type server_ssh_port: int
+    :param connect_timeout: connection timeout in seconds
+    :type connect_timeout: int
+    :return: the connected session
+    :rtype: ssh.session.Session
+    """
+    from ssh.session import Session
+    from ssh import options
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(connect_timeout)
+        sock.connect((server_ip, server_ssh_port))
+    finally:
+        sock.close()
+
+    session = Session()
+    session.options_set(options.USER, server_user)
+    session.options_set(options.HOST, server_ip)
+    session.options_set_port(server_ssh_port)
+    session.options_set(options.TIMEOUT, str(connect_timeout))
+    try:
+        session.connect()
+        session.userauth_publickey(pkey)
+    except Exception:
+        _close_ssh_session(session)
+        raise
+    return session
+
+
+def _ssh_session_alive(session):
+    """check a reused ssh session still works by opening and closing a channel on it
+    :param session: the ssh session
+    :type session: ssh.session.Session
+    :return: whether the session is usable
+    :rtype: bool
+    """
+    try:
+        channel = session.channel_new()
+        channel.open_session()
+        channel.close()
+    except Exception:
+        return False
+    return True
+
+
+def _close_ssh_session(session):
+    """disconnect an ssh session ignoring errors from already dead sessions
+    :param session: the ssh session
+    :type session: ssh.session.Session
+    """
+    try:
+        session.disconnect()
+    except Exception:
+        pass
 
 
 def ssh_retry(obj):
     """
     Decorator to check SSH Connection before method execution.
-    Will perform 30 retries with sleep of 10 seconds
-    between attempts
+    Will perform 30 retries with an exponential backoff, capped
+    at 10 seconds plus jitter, between attempts
     """
     MAX_ATTEMPTS = 30
     MAX_WAIT_TIME = 10
+    BASE_WAIT = 1.0
+    JITTER = 1.0
+    CONNECT_TIMEOUT = 5
 
     def check_access(*args, **kwargs):
         """
@@ -853,6 +1042,9 @@ def ssh_retry(obj):
                 )
 
         def can_connect(group):
+            from ssh.key import import_privkey_file
+            from ssh.exceptions import SSHError, HostKeyNotVerifiable, AuthenticationError, ConnectFailed, \
+                ConnectionLost
 
             sys_vars = group.vars
             server_ip = group.hosts[0].address
@@ -865,39 +1057,51 @@ def ssh_retry(obj):
             server_user = sys_vars['ansible_user']
             server_key_file = sys_vars['ansible_ssh_private_key_file']
             server_ssh_port = 22 if 'ansible_port' not in sys_vars else sys_vars.get('ansible_port')
+            # fail fast on unreachable hosts instead of waiting for the OS tcp connect timeout
+            connect_timeout = int(sys_vars.get('ansible_ssh_timeout', CONNECT_TIMEOUT))
+
+            # skip the check if the server was recently checked
+            cache_key = (server_ip, server_user, server_key_file, server_ssh_port)
+            cached = _SSH_CHECK_CACHE.get(cache_key)
+            if cached and time.time() < cached[1]:
+                LOG.debug("Server %s - IP: %s was checked recently, skipping ssh check." % (group, server_ip))
+                return cached[0]
 
             # Perform SSH checks
             attempt = 1
             while attempt <= MAX_ATTEMPTS:
                 try:
-                    # Test ssh connection
-                    pkey = import_privkey_file(server_key_file)
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.connect((server_ip, server_ssh_port))
-
-                    session = Session()
-                    session.options_set(options.USER, server_user)
-                    session.options_set(options.HOST, server_ip)
-                    session.options_set_port(server_ssh_port)
-                    session.options_set(options.TIMEOUT, '5')
-
-                    # Test ssh connection
-                    session.connect()
-                    rc = session.userauth_publickey(pkey)
+                    with _ssh_session_lock(cache_key):
+                        # reuse the session from a previous check while it is still alive
+                        owner, session = _SSH_SESSIONS.pop(cache_key, (None, None))
+                        if owner != os.getpid():
+                            # opened by the parent process, it still owns the connection
+                            session = None
+                        elif session is not None and not _ssh_session_alive(session):
+                            _close_ssh_session(session)
+                            session = None
+                        if session is None:
+                            # Test ssh connection
+                            pkey = import_privkey_file(server_key_file)
+                            session = _open_ssh_session(server_ip, server_user, pkey, server_ssh_port,
+                                                        connect_timeout)
+                        _SSH_SESSIONS[cache_key] = (os.getpid(), session)
                     LOG.debug("Server %s - IP: %s is reachable." %
                               (group, server_ip))
                     break
 
-                except (SSHError, HostKeyNotVerifiable, AuthenticationError, socket.error, ConnectFailed,
-                        ConnectionLost) as ex:
+                except (SSHError, HostKeyNotVerifiable, AuthenticationError, socket.error, socket.timeout,
+                        ConnectFailed, ConnectionLost) as ex:
                     attempt = attempt + 1
                     LOG.error(ex)
                     LOG.error("Server %s - IP: %s is unreachable." % (group,
                                                                       server_ip))
                     if attempt <= MAX_ATTEMPTS:
-                        LOG.info('Attempt %s of %s: retrying in %s seconds' %
-                                 (attempt, MAX_ATTEMPTS, MAX_WAIT_TIME))
-                        time.sleep(MAX_WAIT_TIME)
+                        wait_time = min(MAX_WAIT_TIME, BASE_WAIT * (2 ** (attempt - 2))) + \
+                            random.uniform(0, JITTER)
+                        LOG.info('Attempt %s of %s: retrying in %.1f seconds' %
+                                 (attempt, MAX_ATTEMPTS, wait_time))
+                        time.sleep(wait_time)
 
             # Check Max SSH Retries performed
             if attempt > MAX_ATTEMPTS:
@@ -905,22 +1109,34 @@ def ssh_retry(obj):
                     'Max Retries exceeded. SSH ERROR - Resource unreachable - Server %s - IP: %s!' %
                     (group, server_ip)
                 )
+                _SSH_CHECK_CACHE[cache_key] = (True, time.time() + _SSH_CHECK_FAILED_TTL)
                 return True
+            _SSH_CHECK_CACHE[cache_key] = (False, time.time() + _SSH_CHECK_TTL)
             return False
 
+        # resolve the groups to check up-front so each one is checked by its own worker
+        resolved_groups = list()
         for host_group in host_groups:
             inv_group = inv_groups[host_group]
             # This is just here for backwards compat. In case I've missed any
             # corner case
             if hasattr(inv_group, 'child_groups') and inv_group.child_groups:
                 LOG.debug('In the child group block')
-                for group in inv_group.child_groups:
-                    ssh_errs = can_connect(group)
+                resolved_groups.extend(inv_group.child_groups)
             else:
                 # Most cases should be falling into this block,
                 # based on teflo returning the actual host asset name once its
                 # done with its fetch_assets logic
-                ssh_errs = can_connect(inv_group)
+                resolved_groups.append(inv_group)
+
+        # only local hosts need no ssh check at all, skip setting up the workers
+        local_only = all(group.hosts and is_host_localhost(group.hosts[0].address) for group in resolved_groups)
+
+        # check the groups concurrently, total wait is bound by the slowest host
+        if resolved_groups and not local_only:
+            with ThreadPoolExecutor(max_workers=min(32, len(resolved_groups))) as executor:
+                futures = [executor.submit(can_connect, group) for group in resolved_groups]
+                ssh_errs = any([future.result() for future in as_completed(futures)])
 
         # Check for SSH Errors
         if ssh_errs:
@@ -935,6 +1151,34 @@ def ssh_retry(obj):
     return check_access
 
 
+def clear_ssh_cache():
+    """Clear the cached ssh connectivity results used by ssh_retry."""
+    _SSH_CHECK_CACHE.clear()
+
+
+@atexit.register
+def close_ssh_sessions():
+    """Disconnect the ssh sessions kept open by ssh_retry in this process."""
+    pid = os.getpid()
+    while _SSH_SESSIONS:
+        owner, session = _SSH_SESSIONS.popitem()[1]
+        if owner == pid:
+            _close_ssh_session(session)
+
+
+def _forget_ssh_sessions():
+    """drop the ssh sessions and locks inherited by a forked child without disconnecting them,
+    the parent process keeps using those connections."""
+    global _SSH_SESSION_LOCKS_GUARD
+    _SSH_SESSIONS.clear()
+    _SSH_SESSION_LOCKS.clear()
+    _SSH_SESSION_LOCKS_GUARD = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_ssh_sessions)
+
+
 def get_ans_verbosity(config):
     """Setting ansible verbosity
     If the verbosity is not set in teflo.cfg, then the teflo log_level is checked.
@@ -981,6 +1225,14 @@ class DataInjector(object):
     when orchestrate/execute tasks require data from the hosts itself.
     """
 
+    # regular expression to search for in the string
+    # data to be injected needs to be in the format of
+    # { host01.metadata.k1 }
+    _VAR_RE = re.compile(r"\{(.*?)\}")
+
+    # regex to check jsonpath strings
+    _EXCL_RE = re.compile(r"^range|^[|.|$|@]|[\w|']+:")
+
     def __init__(self, hosts):
         """Constructor.
 
@@ -989,13 +1241,8 @@ class DataInjector(object):
         """
         self.hosts = hosts
 
-        # regular expression to search for in the string
-        # data to be injected needs to be in the format of
-        # { host01.metadata.k1 }
-        self.regexp = r"\{(.*?)\}"
-
-        # regex to check jsonpath strings
-        self.exclusion_chk_str = r"^range|^[|.|$|@]|[\w|']+:"
+        # index of host name to host resource, built by host_exist on first use
+        self._host_index = None
 
     def host_exist(self, node):
         """Determine if the host defined in the string formatted var is valid.
@@ -1007,10 +1254,17 @@ class DataInjector(object):
         :return: teflo host resource matching based on node input
         :rtype: object
         """
-        for host in self.hosts:
-            if node == getattr(host, 'name'):
-                return host
-        raise TefloError('Node %s not found!' % node)
+        if self._host_index is None:
+            # hosts may also be plain host names (e.g. all_hosts), only resources are indexed
+            self._host_index = dict()
+            for host in self.hosts or []:
+                name = getattr(host, 'name', None)
+                if name is not None:
+                    self._host_index.setdefault(name, host)
+        try:
+            return self._host_index[node]
+        except KeyError:
+            raise TefloError('Node %s not found!' % node)
 
     def inject(self, command):
         """Main worker.
@@ -1023,77 +1277,91 @@ class DataInjector(object):
         :rtype: str
         """
 
-        variables = list(map(str.strip, re.findall(self.regexp, command)))
-
-        if not variables.__len__():
+        # nothing to inject, most strings do not have a template
+        if '{' not in command:
             return command
 
-        for variable in variables:
-            if re.match(self.exclusion_chk_str, variable):
+        # values resolved within this command, a variable may be used more than once
+        resolved = dict()
+
+        def replace(match):
+            variable = match.group(1).strip()
+            if self._EXCL_RE.match(variable):
                 LOG.debug("JSONPath format was identified in the command %s." % variable)
-                continue
-            else:
-                value = None
-                _vars = variable.split('.')
-                node = _vars.pop(0)
+                return match.group(0)
+            if variable not in resolved:
+                resolved[variable] = self.resolve(variable)
+            return resolved[variable]
 
-                # verify variable has a valid host set
-                host = self.host_exist(node)
+        return self._VAR_RE.sub(replace, command)
 
-                for index, item in enumerate(_vars):
-                    try:
-                        # is the item intended to be a position in a list, if so
-                        # get the key and position
-                        key = item.split('[')[0]
-                        pos = int(item.split('[')[1].split(']')[0])
-
-                        if value:
-                            # get the latest value from the dictionary
-                            value = value[key][pos]
-                        else:
-                            # get latest value from host
-                            if hasattr(host, key) and index <= 0:
-                                value = getattr(host, key)[pos]
-                                if isinstance(value, str):
-                                    break
-
-                        # is the value a dict, if so keep going!
-                        if isinstance(value, dict):
-                            continue
-                    except IndexError:
-                        # item is not intended to be a position in a list
-
-                        # check if the item is an attribute of the host
-                        if hasattr(host, item) and index <= 0:
-                            value = getattr(host, item)
-
-                            if isinstance(value, str):
-                                # we know the value has no further traversing to do
-                                break
-                            # value is either a list or dict, more traversing to do
-                            continue
-                        else:
-                            if value is None:
-                                raise AttributeError('%s not found in host %s!' %
-                                                     (item, getattr(host, 'name')))
-
-                        # check if the item's value is a dict and update the value
-                        # for further traversing to do
-                        try:
-                            if isinstance(value[item], dict):
-                                value = value[item]
-                                continue
-                        except KeyError:
-                            raise TefloError('%s not found in %s' % (item, value))
+    def resolve(self, variable):
+        """Lookup the value of a string formatted var from its host.
 
-                        # final check to get value no more traversing required
-                        if value:
-                            value = value[item]
-                    except KeyError:
-                        raise TefloError('Unable to locate item %s!' % item)
+        :param variable: the var to resolve, i.e. host01.metadata.k1
+        :type variable: str
+        :return: the value of the var
+        :rtype: str
+        """
+        value = None
+        _vars = variable.split('.')
+        node = _vars.pop(0)
+
+        # verify variable has a valid host set
+        host = self.host_exist(node)
+
+        for index, item in enumerate(_vars):
+            try:
+                # is the item intended to be a position in a list, if so
+                # get the key and position
+                key = item.split('[')[0]
+                pos = int(item.split('[')[1].split(']')[0])
+
+                if value:
+                    # get the latest value from the dictionary
+                    value = value[key][pos]
+                else:
+                    # get latest value from host
+                    if hasattr(host, key) and index <= 0:
+                        value = getattr(host, key)[pos]
+                        if isinstance(value, str):
+                            break
+
+                # is the value a dict, if so keep going!
+                if isinstance(value, dict):
+                    continue
+            except IndexError:
+                # item is not intended to be a position in a list
 
-                command = command.replace('{ %s }' % variable, value)
-        return command
+                # check if the item is an attribute of the host
+                if hasattr(host, item) and index <= 0:
+                    value = getattr(host, item)
+
+                    if isinstance(value, str):
+                        # we know the value has no further traversing to do
+                        break
+                    # value is either a list or dict, more traversing to do
+                    continue
+                else:
+                    if value is None:
+                        raise AttributeError('%s not found in host %s!' %
+                                             (item, getattr(host, 'name')))
+
+                # check if the item's value is a dict and update the value
+                # for further traversing to do
+                try:
+                    if isinstance(value[item], dict):
+                        value = value[item]
+                        continue
+                except KeyError:
+                    raise TefloError('%s not found in %s' % (item, value))
+
+                # final check to get value no more traversing required
+                if value:
+                    value = value[item]
+            except KeyError:
+                raise TefloError('Unable to locate item %s!' % item)
+        return value
 
     def inject_dictionary(self, dictionary):
         """
@@ -1150,7 +1418,9 @@ def is_host_localhost(host_ip):
     initially verify its localhost if the ip_address has a value of either:
         - 127.0.0.1
         - localhost
-    If the host ip_address is either of those, then we know that the machine
+        - ::1
+        - 0.0.0.0
+    If the host ip_address is any of those, then we know that the machine
     is the localhost.
 
     :param host_ip: host resource ip address
@@ -1158,9 +1428,7 @@ def is_host_localhost(host_ip):
     :return: whether the ip address is localhost or not
     :rtype: bool
     """
-    if host_ip not in ['127.0.0.1', 'localhost']:
-        return False
-    return True
+    return isinstance(host_ip, string_types) and host_ip in _LOCALHOST
 
 
 def find_artifacts_on_disk(data_folder, report_name, art_location=[]):
@@ -1188,13 +1456,8 @@ def find_artifacts_on_disk(data_folder, report_name, art_location=[]):
     fnd_paths.extend(search_artifact_location_dict(art_location, report_name, data_folder, regquery))
 
     # attempt to walk the directory as well in case there was anything else the user wanted collected
-    walked_list = walk_results_directory(data_folder, fnd_paths)
-
-    # check for any matches from the walked list
-    matches = [regquery.search(p) for p in walked_list]
-
-    # Add any matches from walked list to the found artifacts list
-    fnd_paths.extend([m.string for m in matches if m])
+    # and add any matches from the walk to the found artifacts list
+    fnd_paths.extend(walk_results_directory(data_folder, fnd_paths, report_name))
 
     if fnd_paths:
         for f in fnd_paths:
@@ -1247,7 +1510,7 @@ def search_artifact_location_dict(art_locations, report_name, data_folder, reg_q
     return artifacts_path
 
 
-def walk_results_directory(dir, path_list):
+def walk_results_directory(dir, path_list, report_name=None):
     """
     Used to walk the .results directory
     when the artifact in question is not in the list of
@@ -1257,25 +1520,33 @@ def walk_results_directory(dir, path_list):
     :type dir: string dir path
     :param path_list: The list of pathes that was found in artifact_locations
     :type path_list: List
-    :return: a list containing all the paths from data_folder and .results
+    :param report_name: The artifact name pattern the paths need to match, all paths are yielded if None
+    :type report_name: a string of an artifact name, can contain shell file matching pattern
+    :return: a generator of the matching paths from data_folder and .results
     """
 
-    data_dir_list = []
+    path_set = set(path_list)
 
-    # Teflo specific folders in datafolder and .results folder
-    exclude = ['logs', 'rp_logs', 'rp_payload', 'inventory']
+    # a pattern without a directory is matched against the file names only,
+    # otherwise it needs to be searched for in the full path
+    reg_query = None
+    if report_name is not None and '/' in report_name:
+        reg_query = build_artifact_regex_query(report_name)
 
-    # iterate over the data folder first
-    for root, dirs, files in os.walk(dir):
+    # iterate over the data folder first, walking an absolute path so the
+    # roots are already absolute and don't need to be resolved per file
+    for root, dirs, files in os.walk(os.path.abspath(dir)):
         # Excluding teflo specific folders
-        dirs[:] = [d for d in dirs if d not in exclude]
+        dirs[:] = [d for d in dirs if d not in _RESULTS_EXCLUDE_DIRS]
+        if report_name is not None and reg_query is None:
+            files = fnmatch.filter(files, report_name)
         for f in files:
-            p = os.path.abspath(os.path.join(root, f))
-            if p not in path_list:
-                LOG.debug(p)
-                data_dir_list.append(p)
-
-    return data_dir_list
+            p = os.path.normpath(os.path.join(root, f))
+            if p in path_set:
+                continue
+            LOG.debug(p)
+            if reg_query is None or reg_query.search(p):
+                yield p
 
 
 def build_artifact_regex_query(name):
@@ -1293,6 +1564,35 @@ def build_artifact_regex_query(name):
     return regquery
 
 
+def _safe_load_yaml(stream):
+    """safely load yaml using libyaml when available. Malformed yaml is parsed again with the pure
+    python loader since its errors point at the offending line with a snippet of the source
+    :param stream: yaml data
+    :type stream: str
+    :return: the loaded data
+    """
+    try:
+        return yaml.load(stream, Loader=_SafeLoader)
+    except yaml.YAMLError:
+        if _SafeLoader is yaml.SafeLoader:
+            raise
+        return yaml.safe_load(stream)
+
+
+@lru_cache(maxsize=64)
+def _load_vars(path, mtime):
+    """load a jinja template vars file, cached on its path and modification time so the same
+    file is only parsed again once it changes. The returned data must not be modified.
+    :param path: vars file path
+    :type path: str
+    :param mtime: modification time of the vars file
+    :type mtime: float
+    :return: vars data
+    :rtype: dict
+    """
+    return file_mgmt('r', path)
+
+
 def validate_render_scenario(scenario, temp_data_raw=[]):
     """
     This method takes the absolute path of the scenario descriptor file and returns back a list of
@@ -1316,15 +1616,17 @@ def validate_render_scenario(scenario, temp_data_raw=[]):
     if isinstance(temp_data_raw, tuple):
         temp_data_raw = list(temp_data_raw)
     # Convert each item to an object, then reduce them all back to one
-    temp_data_objs = [file_mgmt('r', t) if os.path.isfile(t) else json.loads(t) for t in temp_data_raw]
+    temp_data_objs = [_load_vars(t, os.path.getmtime(t)) if os.path.isfile(t) else json.loads(t)
+                      for t in temp_data_raw]
     # Reduce it down to a single object we can work with
     temp_data = {}
     [temp_data.update(t) for t in temp_data_objs]
     temp_data.update(os.environ)
     try:
-        data = yaml.safe_load(template_render(scenario, temp_data))
+        rendered = template_render(scenario, temp_data)
+        data = _safe_load_yaml(rendered)
         # adding master scenario as the first scenario data stream
-        scenario_stream_list.append(template_render(scenario, temp_data))
+        scenario_stream_list.append(rendered)
         if 'include' in data.keys():
             include_item = data['include']
             include_template = list()
@@ -1334,8 +1636,9 @@ def validate_render_scenario(scenario, temp_data_raw=[]):
                         item = os.path.abspath(item)
                         # check to verify the data in included scenario is valid
                         try:
-                            yaml.safe_load(template_render(item, temp_data))
-                            include_template.append(template_render(item, temp_data))
+                            rendered_include = template_render(item, temp_data)
+                            _safe_load_yaml(rendered_include)
+                            include_template.append(rendered_include)
                         except yaml.YAMLError as err:
                             # raising Teflo error to differentiate the yaml issue is with included scenario
                             raise TefloError('Error loading included scenario data! ' + item + str(err.problem_mark))
@@ -1369,6 +1672,8 @@ def ssh_key_file_generator(workspace, ssh_key_param):
     :type ssh_key_param: value of the ssh_key param either a path or an actual key
     :return: a path to a public key
     """
+    from paramiko import RSAKey
+    from paramiko.ssh_exception import SSHException
 
     # setup absolute path for key
     key = os.path.join(workspace, ssh_key_param)
@@ -1398,6 +1703,22 @@ def ssh_key_file_generator(workspace, ssh_key_param):
         return key
 
 
+def _dns_ttl():
+    """get the lookup_ip_of_hostname cache ttl from TEFLO_DNS_TTL, falling back to the default
+    when it is not set or not an integer
+    :return: ttl in seconds
+    :rtype: int
+    """
+    ttl = os.environ.get('TEFLO_DNS_TTL')
+    if ttl is None:
+        return _DNS_TTL
+    try:
+        return int(ttl)
+    except ValueError:
+        LOG.warning('TEFLO_DNS_TTL %s is not an integer, using %s seconds' % (ttl, _DNS_TTL))
+        return _DNS_TTL
+
+
 def lookup_ip_of_hostname(host_name):
     """
     A method to find the ip of the hostname.
@@ -1407,11 +1728,20 @@ def lookup_ip_of_hostname(host_name):
     is an actual IP address we need to look it up
 
 
+    Resolved addresses are cached for TEFLO_DNS_TTL seconds (default 300)
+    since the same host is often looked up several times in one run.
+
     :param host_name: the FQDN of the host
     :type host_name: string
     :return: return a string containing the ip
     """
-    return socket.gethostbyname(host_name)
+    now = time.time()
+    cached = _DNS_CACHE.get(host_name)
+    if cached and cached[1] > now:
+        return cached[0]
+    ip = socket.gethostbyname(host_name)
+    _DNS_CACHE[host_name] = (ip, now + _dns_ttl())
+    return ip
 
 
 def set_task_class_concurrency(task, resource):
@@ -1441,21 +1771,13 @@ def mask_credentials_password(credentials):
     :param credentials:
     :return: credentials dict
     """
-    asteriks = ''
     masked_creds = dict()
     if credentials:
         for k, v in credentials.items():
-            for p in ['password', 'token', 'key', 'id']:
-                if p not in k:
-                    continue
-                else:
-                    for i in range(0, len(v)):
-                        asteriks += '*' * random.randint(1, 3)
-            if asteriks != '':
-                masked_creds.update({k: asteriks})
-                asteriks = ''
+            if v and any(p in k for p in _SENSITIVE_CRED_KEYS):
+                masked_creds[k] = _CRED_MASK
                 continue
-            masked_creds.update({k: v})
+            masked_creds[k] = v
 
     return masked_creds
 
@@ -1465,11 +1787,7 @@ def sort_tasklist(user_tasks):
     :param user_tasks:
     :return: Array of tasks
     """
-
-    try:
-        return sorted(user_tasks, key=TASKLIST.index)
-    except IndexError:
-        return sorted(user_tasks, key=NOTIFYSTATES.index)
+    return sorted(user_tasks, key=lambda t: _TASK_ORDER.get(t, _NOTIFY_ORDER.get(t, len(_TASK_ORDER))))
 
 
 def validate_cli_scenario_option(ctx, scenario, vars_data=None):
@@ -1496,7 +1814,42 @@ def validate_cli_scenario_option(ctx, scenario, vars_data=None):
         ctx.exit(1)
 
 
-def create_individual_testrun_results(artifact_locations, config):
+def _count_xml_testcases(path):
+    """stream an xunit xml file and count its testcases without building the whole tree in memory.
+    Only testcases of the root testsuite, or of the testsuite elements directly under a root testsuites
+    element, are counted
+    :param path: path of the xml file
+    :type path: str
+    :return trun: summary of total, failed, skipped and passed tests or None if the root tag is not
+                  testsuite or testsuites, or a root testsuites has no testsuite element
+    :rtype trun: dict
+    """
+    trun = dict(total_tests=0, failed_tests=0, skipped_tests=0, passed_tests=0)
+    stack = list()
+    suite_found = False
+    for event, elem in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if not stack and elem.tag not in ('testsuites', 'testsuite'):
+                return None
+            if elem.tag == 'testsuite' and stack in ([], ['testsuites']):
+                suite_found = True
+            stack.append(elem.tag)
+            continue
+        stack.pop()
+        if elem.tag == 'testcase' and stack in (['testsuite'], ['testsuites', 'testsuite']):
+            trun['total_tests'] += 1
+            if elem.find('failure') is not None:
+                trun['failed_tests'] += 1
+            if elem.find('skipped') is not None:
+                trun['skipped_tests'] += 1
+            elem.clear()
+    if not suite_found:
+        return None
+    trun['passed_tests'] = trun['total_tests'] - trun['failed_tests'] - trun['skipped_tests']
+    return trun
+
+
+def create_individual_testrun_results(artifact_locations, config, aggregate=None):
     """this method creates a summary of total tests passed, failed, skipped for all the xml files found
     as artifacts
      :param artifact_locations: list of relative paths of artifacts where root dir is the key and artifact names are
@@ -1504,6 +1857,8 @@ def create_individual_testrun_results(artifact_locations, config):
      :type artifact_locations: list
      :param config: config parameter used by execute resource
      :type config: dict
+     :param aggregate: running totals updated in place with each xml file summary
+     :type aggregate: dict
      :return testruns: a dictionary of test results summary for individual xml files as well as aggregate of all xml
                        files found
      :rtype testruns: dict
@@ -1516,35 +1871,15 @@ def create_individual_testrun_results(artifact_locations, config):
     fnd_paths.extend(search_artifact_location_dict(artifact_locations, '*.xml', config.get('RESULTS_FOLDER'), regquery))
     try:
         for path in fnd_paths:
-            trun = dict()
-            trun['total_tests'] = 0
-            trun['failed_tests'] = 0
-            trun['skipped_tests'] = 0
-            trun['passed_tests'] = 0
-            tree = ET.parse(path)
-            root = tree.getroot()
-            temp = list()
-            # if root.tag is testsuites then collect all the element which are 'testsuite'
-            # if root.tag is testsuite then just collect that element
-            if root.tag == "testsuites":
-                temp.extend(root.findall('testsuite'))
-            elif root.tag == "testsuite":
-                temp.append(root)
-            if temp:
-                for test in temp:
-                    trun['total_tests'] = trun['total_tests'] + len(test.findall('testcase'))
-                    trun['failed_tests'] = trun['failed_tests'] + len([testcase.find('failure')
-                                                                        for testcase in test.findall('testcase')
-                                                                        if testcase.findall('failure')])
-                    trun['skipped_tests'] = trun['skipped_tests'] + len([testcase.find('skipped')
-                                                                         for testcase in test.findall('testcase')
-                                                                         if testcase.findall('skipped')])
-                    trun['passed_tests'] = trun['total_tests'] - trun['failed_tests'] - trun['skipped_tests']
-                individual_res.append({os.path.basename(path): trun})
-            else:
+            trun = _count_xml_testcases(path)
+            if trun is None:
                 LOG.warning("The xml file %s does not have the correct format (no 'testsuite' or 'testsuites'"
                             " tags) to collect testrun results" % path)
                 continue
+            individual_res.append({os.path.basename(path): trun})
+            if aggregate is not None:
+                for key, count in trun.items():
+                    aggregate[key] += count
     except ET.ParseError:
         raise TefloError("The xml file %s is malformed " % path)
     return individual_res
@@ -1592,11 +1927,10 @@ def create_testrun_results(artifact_locations, config):
                        files found
      :rtype testruns: dict
      """
-    testruns = dict()
-    individual_results = create_individual_testrun_results(artifact_locations, config)
-    testruns.update(create_aggregate_testrun_results(individual_results))
-    testruns.update(individual_results=individual_results)
-    return testruns
+    # aggregate totals are summed while the xml files are counted instead of in a second pass
+    aggregate = dict(total_tests=0, failed_tests=0, skipped_tests=0, passed_tests=0)
+    individual_results = create_individual_testrun_results(artifact_locations, config, aggregate)
+    return dict(aggregate_testrun_results=aggregate, individual_results=individual_results)
 
 
 def generate_default_template_vars(scenario, notification):
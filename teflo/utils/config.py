@@ -31,6 +31,17 @@ from ..constants import DEFAULT_CONFIG, DEFAULT_CONFIG_SECTIONS, DEFAULT_TASK_CO
 from ..ansible_helpers import AnsibleCredentialManager
 from ..helpers import template_render
 
+# shared result for kinds without any section, avoids an empty list per setter call
+_NO_SECTIONS = ()
+
+# parsed config file sections keyed by the files read with their modification
+# times and the environment they were rendered with
+_LOAD_CACHE = dict()
+
+# section header prefixes (before the ':') consumed by the config setters
+_SECTION_KINDS = frozenset(('credentials', 'orchestrator', 'executor', 'importer', 'feature_toggles',
+                            'task_concurrency', 'setup_logger', 'notifier', 'provisioner', 'timeout'))
+
 
 class Config(dict):
     """The config class.
@@ -38,123 +49,118 @@ class Config(dict):
     Its desired state is for loading the configuration settings supplied by
     the user. The config object is based on pythons dictionary data structure.
     """
+    # the settings live in the dict itself, no per instance __dict__ is needed
+    __slots__ = ('parser', '_parser_sections', '_sections_by_kind')
+
     def __init__(self):
         """Constructor."""
         super(Config, self).__init__(DEFAULT_CONFIG)
         self.__set_parser__()
+        self._sections_by_kind = dict()
 
     def __set_parser__(self):
         """Set the raw config parser."""
         self.parser = RawConfigParser()
+        # the parser keeps filling the same sections dict on every read
+        self._parser_sections = getattr(self.parser, '_sections')
 
     def __del_parser__(self):
         """Delete the raw config parser."""
         del self.parser
 
+    def _classify_sections(self):
+        """Group the parser sections by the setter kind they belong to in a single pass,
+        along with the name following the ':' in the section header."""
+        self._sections_by_kind = dict()
+        for section in self._parser_sections:
+            kind = section.partition(':')[0]
+            if kind in _SECTION_KINDS:
+                self._sections_by_kind.setdefault(kind, []).append((section, section.rpartition(':')[2]))
+
     def __set_defaults__(self):
-        """Set the default configuration settings."""
+        """Collect the default configuration settings."""
+        settings = dict()
         # A check to continue the flow if default section is not provided in teflo.cfg
-        if getattr(self.parser, '_sections').get('defaults'):
-            for k, v in getattr(self.parser, '_sections')['defaults'].items():
+        if self._parser_sections.get('defaults'):
+            for k, v in self._parser_sections['defaults'].items():
                 if k == '__name__':
                     continue
-                self.__setitem__(k.upper(), v)
+                settings[k.upper()] = v
+        return settings
 
     def __set_credentials__(self, **kwargs):
-        """Set the credentials configuration settings."""
+        """Collect the credentials configuration settings."""
         if not kwargs.get("parser"):
-            parser = self.parser
+            parser_sections = self._parser_sections
+            sections = self._sections_by_kind.get('credentials', _NO_SECTIONS)
         else:
-            parser = kwargs["parser"]
+            parser_sections = getattr(kwargs["parser"], '_sections')
+            sections = [(section, section.rpartition(':')[2]) for section in parser_sections
+                        if section.partition(':')[0] == 'credentials']
         credentials = []
 
-        for section in getattr(parser, '_sections'):
-            if not section.startswith('credentials'):
-                continue
-
-            _credentials = {}
-
-            for option in parser.options(section):
-                _credentials[option] = \
-                    parser.get(section, option)
-            _credentials['name'] = section.split(':')[-1]
+        for section, name in sections:
+            _credentials = {k: v for k, v in parser_sections[section].items() if k != '__name__'}
+            _credentials['name'] = name
             credentials.append(_credentials)
 
-        self.__setitem__('CREDENTIALS', credentials)
+        return {'CREDENTIALS': credentials}
 
     def __set_orchestrator__(self):
-        """Set the orchestrator configuration settings."""
-        for section in getattr(self.parser, '_sections'):
-            if not section.startswith('orchestrator'):
-                continue
-
-            orchestrator = section.split(':')[-1]
-
-            for option in self.parser.options(section):
-                self.__setitem__(
-                    (orchestrator + '_' + option).upper(),
-                    self.parser.get(section, option)
-                )
+        """Collect the orchestrator configuration settings."""
+        settings = dict()
+        for section, name in self._sections_by_kind.get('orchestrator', _NO_SECTIONS):
+            prefix = name.upper() + '_'
+            for option, value in self._parser_sections[section].items():
+                if option == '__name__':
+                    continue
+                settings[prefix + option.upper()] = value
+        return settings
 
     def __set_executor__(self):
-        """Set the executor configuration settings."""
-        for section in getattr(self.parser, '_sections'):
-            if not section.startswith('executor'):
-                continue
-
-            executor = section.split(':')[-1]
-
-            for option in self.parser.options(section):
-                self.__setitem__(
-                    (executor + '_' + option).upper(),
-                    self.parser.get(section, option)
-                )
+        """Collect the executor configuration settings."""
+        settings = dict()
+        for section, name in self._sections_by_kind.get('executor', _NO_SECTIONS):
+            prefix = name.upper() + '_'
+            for option, value in self._parser_sections[section].items():
+                if option == '__name__':
+                    continue
+                settings[prefix + option.upper()] = value
+        return settings
 
     def __set_importer__(self):
-        """Set the importer configuration settings."""
-        for section in getattr(self.parser, '_sections'):
-            if not section.startswith('importer'):
-                continue
-
-            importer = section.split(':')[-1]
-
-            for option in self.parser.options(section):
-                self.__setitem__(
-                    (importer + '_' + option).upper(),
-                    self.parser.get(section, option)
-                )
+        """Collect the importer configuration settings."""
+        settings = dict()
+        for section, name in self._sections_by_kind.get('importer', _NO_SECTIONS):
+            prefix = name.upper() + '_'
+            for option, value in self._parser_sections[section].items():
+                if option == '__name__':
+                    continue
+                settings[prefix + option.upper()] = value
+        return settings
 
     def __set_feature_toggles__(self):
-        """Set the feature toggle configuration settings."""
+        """Collect the feature toggle configuration settings."""
         toggles = []
 
-        for section in getattr(self.parser, '_sections'):
-            if not section.startswith('feature_toggles'):
-                continue
-
-            _toggles = {}
-
-            for option in self.parser.options(section):
-                _toggles[option] = \
-                    self.parser.get(section, option)
-                _toggles['name'] = section.split(':')[-1]
+        for section, name in self._sections_by_kind.get('feature_toggles', _NO_SECTIONS):
+            _toggles = {k: v for k, v in self._parser_sections[section].items() if k != '__name__'}
+            if _toggles:
+                _toggles['name'] = name
                 toggles.append(_toggles)
 
-        self.__setitem__('TOGGLES', toggles)
+        return {'TOGGLES': toggles}
 
     def __set_task_concurrency__(self):
-        """Set the task if it should be executed concurrently."""
+        """Collect the tasks that should be executed concurrently."""
 
         _concurrency_settings = DEFAULT_TASK_CONCURRENCY
 
-        for section in getattr(self.parser, '_sections'):
-            if not section.startswith('task_concurrency'):
-                continue
+        for section, _ in self._sections_by_kind.get('task_concurrency', _NO_SECTIONS):
+            _concurrency_settings.update((option.upper(), value) for option, value
+                                         in self._parser_sections[section].items() if option != '__name__')
 
-            for option in self.parser.options(section):
-                _concurrency_settings.update({option.upper(): self.parser.get(section, option)})
-
-        self.__setitem__('TASK_CONCURRENCY', _concurrency_settings)
+        return {'TASK_CONCURRENCY': _concurrency_settings}
 
     def __set_setup_logger__(self):
         """
@@ -164,50 +170,33 @@ class Config(dict):
         """
         _logging_settings = []
 
-        for section in getattr(self.parser, '_sections'):
-            if not section.startswith('setup_logger'):
-                continue
-
-            for option in self.parser.options(section):
-                _logging_settings.append(self.parser.get(section, option))
+        for section, _ in self._sections_by_kind.get('setup_logger', _NO_SECTIONS):
+            _logging_settings.extend(value for option, value in self._parser_sections[section].items()
+                                     if option != '__name__')
 
-        self.__setitem__('SETUP_LOGGER', _logging_settings)
+        return {'SETUP_LOGGER': _logging_settings}
 
     def __set_notifications__(self):
-        """Set the notification configuration settings."""
+        """Collect the notification configuration settings."""
         notifications = []
 
-        for section in getattr(self.parser, '_sections'):
-            if not section.startswith('notifier'):
-                continue
-
-            _notifications = {}
-
-            for option in self.parser.options(section):
-                _notifications[option] = \
-                    self.parser.get(section, option)
-            _notifications['name'] = section.split(':')[-1]
+        for section, name in self._sections_by_kind.get('notifier', _NO_SECTIONS):
+            _notifications = {k: v for k, v in self._parser_sections[section].items() if k != '__name__'}
+            _notifications['name'] = name
             notifications.append(_notifications)
 
-        self.__setitem__('NOTIFICATIONS', notifications)
+        return {'NOTIFICATIONS': notifications}
 
     def __set_provisioner__(self):
-        """Set the provisioner configuration settings."""
+        """Collect the provisioner configuration settings."""
         provisioner_options = []
 
-        for section in getattr(self.parser, '_sections'):
-            if not section.startswith('provisioner'):
-                continue
-
-            _provisioner_options = {}
-
-            for option in self.parser.options(section):
-                _provisioner_options[option] = \
-                    self.parser.get(section, option)
-            _provisioner_options['name'] = section.split(':')[-1]
+        for section, name in self._sections_by_kind.get('provisioner', _NO_SECTIONS):
+            _provisioner_options = {k: v for k, v in self._parser_sections[section].items() if k != '__name__'}
+            _provisioner_options['name'] = name
             provisioner_options.append(_provisioner_options)
 
-        self.__setitem__('PROVISIONER_OPTIONS', provisioner_options)
+        return {'PROVISIONER_OPTIONS': provisioner_options}
 
     def __set_timeout__(self):
         """
@@ -221,12 +210,20 @@ class Config(dict):
         report=100
         """
         _timeout = DEFAULT_TIMEOUT
-        for section in getattr(self.parser, "_sections"):
-            if not section.startswith("timeout"):
-                continue
-            for option in self.parser.options(section):
-                _timeout.update({option.upper(): int(self.parser.get(section, option))})
-        self.__setitem__('TIMEOUT', _timeout)
+        for section, _ in self._sections_by_kind.get('timeout', _NO_SECTIONS):
+            _timeout.update((option.upper(), int(value)) for option, value
+                            in self._parser_sections[section].items() if option != '__name__')
+        return {'TIMEOUT': _timeout}
+
+    @staticmethod
+    def _render(filename):
+        """Render a config file as a jinja template with the environment variables.
+        Files without any template markup are returned as is without setting up jinja."""
+        with open(filename) as f:
+            content = f.read()
+        if '{{' not in content and '{%' not in content and '{#' not in content:
+            return content
+        return template_render(filename, os.environ)
 
     def load(self):
         """Load configuration settings.
@@ -241,20 +238,44 @@ class Config(dict):
             os.path.join(os.getcwd(), 'teflo.cfg')
         ]
 
-        if os.getenv('TEFLO_SETTINGS'):
-            files.append(os.getenv('TEFLO_SETTINGS'))
+        settings_file = os.getenv('TEFLO_SETTINGS')
+        if settings_file:
+            files.append(settings_file)
 
+        sources = list()
         for filename in files:
-            if not os.path.exists(filename):
-                # file not found
+            try:
+                sources.append((filename, os.stat(filename).st_mtime_ns))
+            except OSError:
+                # file not found or not accessible
                 continue
 
-            # read the string returned post rendering the jinja template
-            self.parser.read_string(template_render(filename, os.environ))
-
-            # set user supplied configuration settings overriding defaults
+        if sources:
+            # files are rendered with the environment so it is part of the key as well
+            key = (tuple(sources), tuple(sorted(os.environ.items())))
+            sections = _LOAD_CACHE.get(key)
+            if sections is None:
+                parser = RawConfigParser()
+                for filename, _ in sources:
+                    # read the string returned post rendering the jinja template,
+                    # later files overlay the sections of the earlier ones
+                    parser.read_string(self._render(filename))
+                sections = _LOAD_CACHE[key] = {
+                    section: dict(options) for section, options in getattr(parser, '_sections').items()
+                }
+            self.parser.read_dict(sections)
+            self._classify_sections()
+
+            # set user supplied configuration settings overriding defaults in a single update
+            settings = dict()
             for config in DEFAULT_CONFIG_SECTIONS:
-                getattr(self, '__set_%s__' % config)()
+                settings.update(getattr(self, '__set_%s__' % config)())
+            self.update(settings)
 
         cred_man = AnsibleCredentialManager(self)
         cred_man.populate_teflo_cfg_credentials()
+
+
+def clear_load_cache():
+    """Clear the parsed config files memoized by Config.load()."""
+    _LOAD_CACHE.clear()
@@ -90,7 +90,7 @@ class TestCli(object):
         assert results.exit_code == 0
 
     @staticmethod
-    @mock.patch.object(yaml, 'safe_load')
+    @mock.patch.object(yaml, 'load')
     def test_invalid_run_malformed_input(mock_method, runner):
         mock_method.side_effect = yaml.YAMLError('error')
         results = runner.invoke(
@@ -100,7 +100,7 @@ class TestCli(object):
         assert results.exit_code != 0
 
     @staticmethod
-    @mock.patch.object(yaml, 'safe_load')
+    @mock.patch.object(yaml, 'load')
     def test_invalid_run_malformed_include(mock_method, runner):
         mock_method.side_effect = TefloError('Error loading included scenario data!')
         results = runner.invoke(
@@ -31,7 +31,7 @@ import mock
 
 import pytest
 
-from teflo.utils.config import Config
+from teflo.utils.config import Config, clear_load_cache
 
 
 @pytest.fixture(scope='class')
@@ -63,3 +63,35 @@ class TestConfig(object):
         config.load()
         assert 'smtp.teflo.server.com' in config.parser.get('credentials:email', 'smtp_host')
 
+    @staticmethod
+    def test_load_reuses_parsed_config(tmpdir):
+        cfg = tmpdir.join('teflo.cfg')
+        cfg.write('[defaults]\nlog_level = debug\n')
+        os.environ['TEFLO_SETTINGS'] = str(cfg)
+        clear_load_cache()
+
+        def renders():
+            return [c for c in mock_render.call_args_list if c[0][0] == str(cfg)]
+
+        try:
+            with mock.patch.object(Config, '_render', wraps=Config._render) as mock_render:
+                Config().load()
+                config = Config()
+                config.load()
+                assert len(renders()) == 1
+                assert config['LOG_LEVEL'] == 'debug'
+
+                # a modified file is read again
+                mtime = os.stat(str(cfg)).st_mtime_ns + 10 ** 9
+                os.utime(str(cfg), ns=(mtime, mtime))
+                Config().load()
+                assert len(renders()) == 2
+
+                # so is a file rendered with a different environment
+                os.environ['TEFLO_LOAD_CACHE_TEST'] = 'changed'
+                Config().load()
+                assert len(renders()) == 3
+        finally:
+            os.environ.pop('TEFLO_LOAD_CACHE_TEST', None)
+            os.environ['TEFLO_SETTINGS'] = '../assets/teflo.cfg'
+            clear_load_cache()
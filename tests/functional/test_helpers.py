@@ -27,6 +27,7 @@
 
 import pytest
 import os
+import socket
 import mock
 from teflo import Teflo
 from teflo.core import ImporterPlugin
@@ -41,7 +42,8 @@ from teflo.provisioners.ext import BeakerClientProvisionerPlugin
 from teflo.helpers import DataInjector, validate_render_scenario, set_task_class_concurrency, \
     mask_credentials_password, sort_tasklist, find_artifacts_on_disk, \
     get_default_provisioner_plugin, get_ans_verbosity, schema_validator, filter_resources_labels,\
-    create_individual_testrun_results, create_aggregate_testrun_results, filter_notifications_to_skip
+    create_individual_testrun_results, create_aggregate_testrun_results, filter_notifications_to_skip, \
+    clear_ssh_cache, close_ssh_sessions, ssh_retry, CustomDict
 
 
 @pytest.fixture(scope='class')
@@ -193,6 +195,16 @@ class TestDataInjector(object):
         cmd = data_injector.inject('cmd')
         assert cmd == 'cmd'
 
+    def test_inject_uneven_brace_spacing(self, data_injector):
+        cmd = data_injector.inject('cmd {node01.random} { node01.random} {node01.metadata.k1 }')
+        assert cmd == 'cmd 123 123 v1'
+
+    def test_inject_repeated_variable(self, data_injector):
+        with mock.patch.object(data_injector, 'resolve', wraps=data_injector.resolve) as mock_resolve:
+            cmd = data_injector.inject('cmd { node01.random } --again { node01.random }')
+        assert cmd == 'cmd 123 --again 123'
+        mock_resolve.assert_called_once_with('node01.random')
+
     def test_inject_jsonpath_support_uc1(self, data_injector):
         cmd = data_injector.inject('cmd { .spec }')
         assert cmd == 'cmd { .spec }'
@@ -530,6 +542,14 @@ def test_create_individual_testrun_results_with_incorrect_root_tag(mock_method):
     assert res == []
 
 
+@mock.patch('teflo.helpers.search_artifact_location_dict')
+def test_create_individual_testrun_results_with_no_testsuite(mock_method):
+    """The test case verifies that a testsuites root without any testsuite is skipped with a warning"""
+    mock_method.return_value = ['../assets/artifacts/host04/sample3.xml']
+    res = create_individual_testrun_results({}, {})
+    assert res == []
+
+
 def test_create_aggregate_testrun_results():
     ind_res = [
                 {'sample.xml': {'total_tests': 2, 'failed_tests': 0, 'skipped_tests': 0, 'passed_tests': 2}},
@@ -551,3 +571,68 @@ def test_filter_notifications_to_skip_02(teflo1, notification_on_start_resource,
     teflo1.teflo_options.update(skip_notify=())
     res = filter_notifications_to_skip(notify_list, teflo1.teflo_options)
     assert res == notify_list
+
+
+class SshGroup(object):
+    def __init__(self, address):
+        self.vars = dict(ansible_user='root', ansible_ssh_private_key_file='/tmp/key')
+        self.hosts = [mock.MagicMock(address=address)]
+
+
+@pytest.fixture
+def ssh_checked_task():
+    clear_ssh_cache()
+    close_ssh_sessions()
+    task = mock.MagicMock()
+    task.inventory.groups = {'host01': SshGroup('10.0.0.1')}
+    yield task, ssh_retry(mock.MagicMock(return_value='done'))
+    clear_ssh_cache()
+    close_ssh_sessions()
+
+
+@mock.patch('ssh.key.import_privkey_file')
+@mock.patch('teflo.helpers._ssh_session_alive', return_value=False)
+@mock.patch('teflo.helpers._open_ssh_session')
+@mock.patch('teflo.helpers.time')
+def test_ssh_retry_caches_successful_check(mock_time, mock_open, mock_alive, mock_key, ssh_checked_task):
+    """ this test verifies a successful ssh check is skipped until its ttl expires"""
+    task, run = ssh_checked_task
+    mock_time.time.return_value = 1000
+    assert run(task, extra_vars=dict(hosts='host01')) == 'done'
+    assert run(task, extra_vars=dict(hosts='host01')) == 'done'
+    assert mock_open.call_count == 1
+    mock_time.time.return_value = 1000 + 301
+    assert run(task, extra_vars=dict(hosts='host01')) == 'done'
+    assert mock_open.call_count == 2
+
+
+@mock.patch('ssh.key.import_privkey_file')
+@mock.patch('teflo.helpers._open_ssh_session', side_effect=socket.error('unreachable'))
+@mock.patch('teflo.helpers.time')
+def test_ssh_retry_caches_failed_check(mock_time, mock_open, mock_key, ssh_checked_task):
+    """ this test verifies a failed ssh check is cached for a shorter ttl than a successful one"""
+    task, run = ssh_checked_task
+    mock_time.time.return_value = 1000
+    with pytest.raises(HelpersError):
+        run(task, extra_vars=dict(hosts='host01'))
+    attempts = mock_open.call_count
+    assert attempts > 0
+    mock_time.time.return_value = 1000 + 59
+    with pytest.raises(HelpersError):
+        run(task, extra_vars=dict(hosts='host01'))
+    assert mock_open.call_count == attempts
+    mock_time.time.return_value = 1000 + 61
+    with pytest.raises(HelpersError):
+        run(task, extra_vars=dict(hosts='host01'))
+    assert mock_open.call_count == 2 * attempts
+
+
+def test_custom_dict_nested_access():
+    """ this test verifies nested dicts are returned as CustomDict through every accessor"""
+    cd = CustomDict({'k1': {'k2': {'k3': 'v3'}}, 'k4': ['v4']})
+    assert cd.k1.k2.k3 == 'v3'
+    assert cd.get('k1').k2.k3 == 'v3'
+    assert cd.get('missing') is None
+    assert all(isinstance(v, CustomDict) for v in cd.values() if isinstance(v, dict))
+    assert isinstance(dict(cd.items())['k1'], CustomDict)
+    assert cd.setdefault('k5', {'k6': 'v6'}).k6 == 'v6'